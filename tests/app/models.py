@@ -2,6 +2,7 @@ from wagtail.admin.edit_handlers import FieldPanel
 from wagtail.core.fields import RichTextField
 from wagtail.core.models import Page
 
+from wagtailtranslations.cache import cache_translated_page
 from wagtailtranslations.models import (
     AbstractTranslationIndexPage, TranslatedPage)
 
@@ -16,3 +17,7 @@ class ContentPage(TranslatedPage, Page):
     content_panels = Page.content_panels + [
         FieldPanel('body'),
     ]
+
+    @cache_translated_page(60 * 15)
+    def serve(self, request, *args, **kwargs):
+        return super(ContentPage, self).serve(request, *args, **kwargs)
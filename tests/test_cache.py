@@ -0,0 +1,322 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import (
+    RequestFactory, TestCase, TransactionTestCase, override_settings)
+from django.utils.cache import patch_cache_control
+from django.utils.translation import (
+    LANGUAGE_SESSION_KEY, activate, deactivate, get_language)
+from wagtail.core.models import Page
+
+from tests.app.models import ContentPage, TranslationHomePage
+from wagtailtranslations.cache import (
+    bump_translation_group_version, cache_translated_page, get_cache)
+from wagtailtranslations.models import Language
+
+
+class TranslationCacheTestMixin(object):
+    """
+    Sets up three translation groups:
+
+    * A: ``en_a`` in English and ``fr_a`` in French
+    * B: ``en_b`` in English and ``de_b`` in German
+    * C: ``en_c`` in English
+    """
+    fragment = Template(
+        '{% load wagtailtranslations_tags %}'
+        '{% translationcache 500 fragment page %}{{ value }}{% endtranslationcache %}')
+
+    def setUp(self):
+        get_cache().clear()
+        self.addCleanup(deactivate)
+
+        self.english = Language.objects.create(code='en', is_default=True, order=1)
+        self.french = Language.objects.create(code='fr', order=2)
+        self.german = Language.objects.create(code='de', order=3)
+
+        root = Page.objects.get(depth=1)
+        self.index = root.add_child(instance=TranslationHomePage(
+            title='Translations', slug='translations'))
+
+        self.en_a = self.add_page(self.index, 'en-a', self.english)
+        self.fr_a = self.add_page(self.index, 'fr-a', self.french, self.en_a)
+        self.en_b = self.add_page(self.index, 'en-b', self.english)
+        self.de_b = self.add_page(self.index, 'de-b', self.german, self.en_b)
+        self.en_c = self.add_page(self.index, 'en-c', self.english)
+
+    def add_page(self, parent, slug, language, translation_of=None):
+        page = ContentPage(title=slug, slug=slug, language=language,
+                           body='<p>{}</p>'.format(slug))
+        if translation_of is not None:
+            page.translation_key = translation_of.translation_key
+        return parent.add_child(instance=page)
+
+    def render_fragment(self, page, value, request=None):
+        return self.fragment.render(Context({
+            'page': page, 'value': value, 'request': request}))
+
+
+class TestTranslationCacheTag(TranslationCacheTestMixin, TestCase):
+    def test_fragment_is_cached(self):
+        self.assertEqual(self.render_fragment(self.en_a, 'first'), 'first')
+        self.assertEqual(self.render_fragment(self.en_a, 'second'), 'first')
+
+    def test_fragment_varies_on_page(self):
+        self.assertEqual(self.render_fragment(self.en_a, 'en-a'), 'en-a')
+        self.assertEqual(self.render_fragment(self.fr_a, 'fr-a'), 'fr-a')
+
+    def test_fragment_vary_on_is_quoted(self):
+        context = {'page': self.en_a}
+        first = Template(
+            '{% load wagtailtranslations_tags %}'
+            '{% translationcache 500 a page "b:c" %}first{% endtranslationcache %}')
+        second = Template(
+            '{% load wagtailtranslations_tags %}'
+            '{% translationcache 500 a:b page "c" %}second{% endtranslationcache %}')
+        self.assertEqual(first.render(Context(context)), 'first')
+        self.assertEqual(second.render(Context(context)), 'second')
+
+    def test_fragment_varies_on_language(self):
+        activate('en')
+        self.assertEqual(self.render_fragment(self.en_a, 'en'), 'en')
+        activate('fr')
+        self.assertEqual(self.render_fragment(self.en_a, 'fr'), 'fr')
+        activate('en')
+        self.assertEqual(self.render_fragment(self.en_a, 'other'), 'en')
+
+    def test_preview_is_not_cached(self):
+        request = RequestFactory().get('/')
+        request.is_preview = True
+        self.assertEqual(self.render_fragment(self.en_a, 'draft', request), 'draft')
+        self.assertEqual(self.render_fragment(self.en_a, 'live'), 'live')
+
+    def test_preview_does_not_use_cache(self):
+        request = RequestFactory().get('/')
+        request.is_preview = True
+        self.assertEqual(self.render_fragment(self.en_a, 'live'), 'live')
+        self.assertEqual(self.render_fragment(self.en_a, 'draft', request), 'draft')
+
+    def test_missing_page_is_not_cached(self):
+        self.assertEqual(self.render_fragment(None, 'first'), 'first')
+        self.assertEqual(self.render_fragment(None, 'second'), 'second')
+        self.assertEqual(self.fragment.render(Context({'value': 'third'})), 'third')
+
+    def test_untranslated_page_is_not_cached(self):
+        self.assertEqual(self.render_fragment(self.index, 'first'), 'first')
+        self.assertEqual(self.render_fragment(self.index, 'second'), 'second')
+
+
+class TestTranslationGroupInvalidation(TranslationCacheTestMixin, TransactionTestCase):
+    # Versions are only bumped once a transaction commits, which never
+    # happens inside a TestCase. Restore the root page Wagtail creates in its
+    # migrations after flushing the database.
+    serialized_rollback = True
+
+    def assertInvalidates(self, action, changed, unchanged):
+        """
+        Check ``action`` invalidates fragments cached for the pages in
+        ``changed``, and only those.
+        """
+        for page in changed + unchanged:
+            self.render_fragment(page, 'before')
+        action()
+        for page in changed:
+            self.assertEqual(self.render_fragment(page, 'after'), 'after')
+        for page in unchanged:
+            self.assertEqual(self.render_fragment(page, 'after'), 'before')
+
+    def test_publish(self):
+        self.assertInvalidates(
+            lambda: self.fr_a.save_revision().publish(),
+            changed=[self.en_a, self.fr_a], unchanged=[self.en_b, self.en_c])
+
+    def test_unpublish(self):
+        self.assertInvalidates(
+            lambda: self.fr_a.unpublish(),
+            changed=[self.en_a, self.fr_a], unchanged=[self.en_b, self.en_c])
+
+    def test_delete(self):
+        self.assertInvalidates(
+            lambda: self.fr_a.delete(),
+            changed=[self.en_a], unchanged=[self.en_b, self.en_c])
+
+    def test_save_without_changes(self):
+        self.assertInvalidates(
+            lambda: self.fr_a.save(),
+            changed=[], unchanged=[self.en_a, self.en_b, self.en_c])
+
+    def test_draft_revision(self):
+        def action():
+            self.fr_a.title = 'Draft'
+            self.fr_a.save_revision()
+
+        self.assertInvalidates(
+            action, changed=[], unchanged=[self.en_a, self.en_b, self.en_c])
+
+    def test_new_translation(self):
+        self.assertInvalidates(
+            lambda: self.add_page(self.index, 'de-a', self.german, self.en_a),
+            changed=[self.en_a], unchanged=[self.en_b, self.en_c])
+
+    def test_change_translation_group(self):
+        def action():
+            self.de_b.translation_key = self.en_c.translation_key
+            self.de_b.save()
+
+        self.assertInvalidates(
+            action, changed=[self.en_b, self.en_c], unchanged=[self.en_a])
+
+    def test_change_language(self):
+        def action():
+            self.fr_a.language = self.german
+            self.fr_a.save()
+
+        self.assertInvalidates(
+            action, changed=[self.en_a], unchanged=[self.en_b, self.en_c])
+
+    def test_change_language_and_translation_group(self):
+        def action():
+            self.fr_a.language = self.german
+            self.fr_a.translation_key = self.en_c.translation_key
+            self.fr_a.save()
+
+        self.assertInvalidates(
+            action, changed=[self.en_a, self.en_c], unchanged=[self.en_b])
+
+    def test_save_language(self):
+        def action():
+            self.german.live = False
+            self.german.save()
+
+        self.assertInvalidates(
+            action, changed=[self.en_b], unchanged=[self.en_a, self.en_c])
+
+    def test_move(self):
+        root = Page.objects.get(depth=1)
+        other_index = root.add_child(instance=TranslationHomePage(
+            title='Other', slug='other'))
+
+        self.assertInvalidates(
+            lambda: self.de_b.move(other_index, pos='last-child'),
+            changed=[self.en_b], unchanged=[self.en_a, self.en_c])
+
+    def test_change_ancestor_slug(self):
+        child = self.add_page(self.en_c, 'child', self.english)
+
+        def action():
+            self.en_c.slug = 'renamed'
+            self.en_c.save()
+
+        self.assertInvalidates(
+            action, changed=[self.en_c, child], unchanged=[self.en_a, self.en_b])
+
+
+class TestCacheTranslatedPage(TranslationCacheTestMixin, TestCase):
+    def get_request(self, method='get', user=None, **extra):
+        request = getattr(RequestFactory(), method)('/', **extra)
+        request.session = {}
+        request.user = user or AnonymousUser()
+        return request
+
+    def serve(self, page, request):
+        return page.serve(request).render().content.decode()
+
+    def test_response_is_cached(self):
+        self.assertIn('en-a', self.serve(self.en_a, self.get_request()))
+        self.en_a.title = 'Changed'
+        self.assertNotIn('Changed', self.serve(self.en_a, self.get_request()))
+
+    def test_response_varies_on_page(self):
+        self.assertIn('en-a', self.serve(self.en_a, self.get_request()))
+        self.assertIn('fr-a', self.serve(self.fr_a, self.get_request()))
+
+    @override_settings(ALLOWED_HOSTS=['example.com', 'www.example.com'])
+    def test_response_varies_on_host(self):
+        self.serve(self.en_a, self.get_request(HTTP_HOST='www.example.com'))
+        self.en_a.title = 'Changed'
+        self.assertIn('Changed', self.serve(self.en_a, self.get_request(HTTP_HOST='example.com')))
+        self.en_a.title = 'Changed again'
+        self.assertNotIn('Changed again', self.serve(self.en_a, self.get_request(HTTP_HOST='www.example.com')))
+
+    def test_language_activated_on_cache_hit(self):
+        self.serve(self.fr_a, self.get_request())
+        activate('en')
+
+        self.fr_a.title = 'Changed'
+        request = self.get_request()
+        self.assertNotIn('Changed', self.serve(self.fr_a, request))
+        self.assertEqual(get_language(), 'fr')
+        self.assertEqual(request.LANGUAGE_CODE, 'fr')
+        self.assertEqual(request.session[LANGUAGE_SESSION_KEY], 'fr')
+
+    def test_post_is_not_cached(self):
+        self.assertIn('en-a', self.serve(self.en_a, self.get_request('post')))
+        self.en_a.title = 'Changed'
+        self.assertIn('Changed', self.serve(self.en_a, self.get_request('post')))
+        self.assertIn('Changed', self.serve(self.en_a, self.get_request()))
+
+    def test_preview_is_not_cached(self):
+        request = self.get_request()
+        request.is_preview = True
+        self.en_a.title = 'Draft'
+        self.assertIn('Draft', self.serve(self.en_a, request))
+        self.en_a.title = 'Live'
+        self.assertIn('Live', self.serve(self.en_a, self.get_request()))
+
+    def test_preview_does_not_use_cache(self):
+        self.assertIn('en-a', self.serve(self.en_a, self.get_request()))
+        request = self.get_request()
+        request.is_preview = True
+        self.en_a.title = 'Draft'
+        self.assertIn('Draft', self.serve(self.en_a, request))
+
+    def test_authenticated_user_is_not_cached(self):
+        user = get_user_model()(username='editor')
+        self.assertIn('en-a', self.serve(self.en_a, self.get_request(user=user)))
+        self.en_a.title = 'Changed'
+        self.assertIn('Changed', self.serve(self.en_a, self.get_request()))
+
+    def test_bump_invalidates_response(self):
+        self.assertIn('en-a', self.serve(self.en_a, self.get_request()))
+        bump_translation_group_version(self.en_a.translation_key)
+        self.en_a.title = 'Changed'
+        self.assertIn('Changed', self.serve(self.en_a, self.get_request()))
+
+    def test_non_200_response_is_not_cached(self):
+        calls = []
+
+        @cache_translated_page()
+        def serve(page, request):
+            calls.append(page)
+            return HttpResponse(status=404)
+
+        serve(self.en_a, self.get_request())
+        serve(self.en_a, self.get_request())
+        self.assertEqual(len(calls), 2)
+
+    def test_private_response_is_not_cached(self):
+        calls = []
+
+        @cache_translated_page()
+        def serve(page, request):
+            calls.append(page)
+            response = HttpResponse()
+            patch_cache_control(response, private=True)
+            return response
+
+        serve(self.en_a, self.get_request())
+        serve(self.en_a, self.get_request())
+        self.assertEqual(len(calls), 2)
+
+    def test_public_response_is_cached(self):
+        calls = []
+
+        @cache_translated_page()
+        def serve(page, request):
+            calls.append(page)
+            return HttpResponse()
+
+        serve(self.en_a, self.get_request())
+        serve(self.en_a, self.get_request())
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class WagtailTranslationsAppConfig(AppConfig):
+    name = 'wagtailtranslations'
+    verbose_name = "Wagtail translations"
+
+    def ready(self):
+        from .signal_handlers import register_signal_handlers
+        register_signal_handlers()
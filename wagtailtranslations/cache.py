@@ -0,0 +1,147 @@
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.utils.encoding import force_bytes
+from django.utils.translation import get_language
+
+GROUP_VERSION_KEY = 'wagtailtranslations.group.{translation_key}'
+PAGE_CACHE_KEY = 'wagtailtranslations.page.{page_id}.{language}.{version}.{vary_on}'
+
+
+def get_cache():
+    """
+    Get the cache used for translation group versions and cached page output.
+    Set ``WAGTAILTRANSLATIONS_CACHE`` to use a cache other than ``'default'``.
+    """
+    return caches[getattr(settings, 'WAGTAILTRANSLATIONS_CACHE', 'default')]
+
+
+def get_translation_group_version(translation_key):
+    """
+    Get the current cache version for a translation group. Every cache key
+    built for a page in the group includes this version, so bumping it
+    invalidates all cached output for the group and nothing else.
+    """
+    cache = get_cache()
+    key = GROUP_VERSION_KEY.format(translation_key=translation_key)
+    version = cache.get(key)
+    if version is None:
+        # Start from the current time rather than from 1, so that a version
+        # evicted from the cache never comes back as a version some stale
+        # fragments were saved under.
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_translation_group_version(translation_key):
+    """
+    Invalidate all cached output for a translation group.
+    """
+    cache = get_cache()
+    key = GROUP_VERSION_KEY.format(translation_key=translation_key)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # No version yet, so nothing has been cached under one. Starting a
+        # fresh version is enough.
+        get_translation_group_version(translation_key)
+
+
+def make_page_cache_key(page, vary_on=()):
+    """
+    Build a cache key for some output of a ``TranslatedPage``. The key varies
+    on the page, the active language, the version of the page's translation
+    group, and any extra values in ``vary_on``.
+    """
+    # Quote each value so that different lists never join to the same string
+    vary_on = hashlib.md5(force_bytes(':'.join(quote(str(v)) for v in vary_on)))
+    return PAGE_CACHE_KEY.format(
+        page_id=page.pk,
+        language=get_language() or page.language.code,
+        version=get_translation_group_version(page.translation_key),
+        vary_on=vary_on.hexdigest())
+
+
+def is_cacheable_request(request):
+    """
+    Responses for editors include the Wagtail user bar and other per-user
+    content, so only requests from anonymous visitors are cached.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if getattr(request, 'is_preview', False):
+        return False
+    user = getattr(request, 'user', None)
+    return user is None or not user.is_authenticated
+
+
+def is_cacheable_response(request, response):
+    """
+    Check a rendered response is safe to serve to other visitors.
+    """
+    if response.status_code != 200:
+        return False
+    if response.cookies or request.META.get('CSRF_COOKIE_USED'):
+        return False
+    cache_control = response.get('Cache-Control', '')
+    return 'private' not in [bit.strip().lower() for bit in cache_control.split(',')]
+
+
+def cache_translated_page(timeout=DEFAULT_TIMEOUT):
+    """
+    Cache the response of a ``TranslatedPage.serve`` method:
+
+    .. code-block:: python
+
+        class ContentPage(TranslatedPage, Page):
+            @cache_translated_page(60 * 15)
+            def serve(self, request, *args, **kwargs):
+                return super(ContentPage, self).serve(request, *args, **kwargs)
+
+    Only successful ``GET`` and ``HEAD`` requests from anonymous visitors are
+    cached, and previews are never cached. Responses marked
+    ``Cache-Control: private``, responses that set cookies, and responses that
+    used a CSRF token are not cached either, as they are specific to a visitor.
+    Responses are cached per page, language, and full URL, and are
+    invalidated whenever any page in the translation group changes. Nothing
+    else invalidates them, so menus, listings, snippets and content from other
+    groups stay stale until the timeout expires.
+    """
+    def decorator(serve):
+        @wraps(serve)
+        def wrapper(page, request, *args, **kwargs):
+            if not is_cacheable_request(request):
+                return serve(page, request, *args, **kwargs)
+
+            # Cached responses skip TranslatedPage.serve, so the language it
+            # would activate must be activated here. This also makes sure the
+            # cache key is built for the page language.
+            page.activate_language(request)
+
+            cache = get_cache()
+            # Output such as absolute page URLs depends on the scheme and host,
+            # so these are part of the key as well as the path.
+            key = make_page_cache_key(page, [request.build_absolute_uri()])
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            response = serve(page, request, *args, **kwargs)
+
+            def set_cache(response):
+                if is_cacheable_response(request, response):
+                    cache.set(key, response, timeout)
+
+            if hasattr(response, 'render') and callable(response.render):
+                response.add_post_render_callback(set_cache)
+            else:
+                set_cache(response)
+            return response
+        return wrapper
+    return decorator
@@ -210,10 +210,13 @@ class TranslatedPage(Page):
             # ('translation_key', 'language'),
         ]
 
-    def serve(self, request, *args, **kwargs):
+    def activate_language(self, request):
         activate(self.language.code)
         request.LANGUAGE_CODE = self.language.code
         request.session[LANGUAGE_SESSION_KEY] = self.language.code
+
+    def serve(self, request, *args, **kwargs):
+        self.activate_language(request)
         return super(TranslatedPage, self).serve(request, *args, **kwargs)
 
     def get_translations(self):
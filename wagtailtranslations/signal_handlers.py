@@ -0,0 +1,106 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from wagtail.core.models import Page
+from wagtail.core.signals import page_published, page_unpublished
+
+from .cache import bump_translation_group_version
+from .models import Language, TranslatedPage
+
+TRANSLATION_FIELDS = {'language', 'language_id', 'translation_key'}
+URL_FIELDS = {'slug', 'url_path'}
+
+
+def bump_on_commit(translation_keys):
+    """
+    Bump the versions of some translation groups once the current transaction
+    commits. Bumping any earlier would let a concurrent request cache
+    output built from the old state of the database under the new version.
+    """
+    translation_keys = set(translation_keys)
+
+    def bump():
+        for translation_key in translation_keys:
+            bump_translation_group_version(translation_key)
+
+    transaction.on_commit(bump)
+
+
+def translated_page_changed(instance, **kwargs):
+    if isinstance(instance, TranslatedPage):
+        bump_on_commit([instance.translation_key])
+
+
+def page_pre_save(instance, update_fields=None, raw=False, **kwargs):
+    """
+    Record the URL path, language and translation group a page had before
+    saving, so that moving it can invalidate the groups it affects once it has
+    been saved. ``Page.move`` saves a plain ``Page``, so all pages are checked.
+    """
+    if raw or not isinstance(instance, Page) or instance.pk is None:
+        return
+
+    if isinstance(instance, TranslatedPage):
+        model, fields = TranslatedPage, URL_FIELDS | TRANSLATION_FIELDS
+        values = ['url_path', 'translation_key', 'language_id']
+    else:
+        model, fields = Page, URL_FIELDS
+        values = ['url_path']
+    if update_fields is not None and not fields & set(update_fields):
+        return
+
+    instance._translation_cache_state = model.objects\
+        .filter(pk=instance.pk)\
+        .values(*values)\
+        .first()
+
+
+def page_post_save(instance, created, raw=False, **kwargs):
+    """
+    Saving a page only changes its published content through publishing,
+    which is handled separately. New pages and pages moved to another
+    language or translation group change the groups they are in, though.
+    Moving a page or changing its slug changes the URL of it and all of its
+    descendants, and so all of their groups.
+    """
+    if raw or not isinstance(instance, Page):
+        return
+
+    old = instance.__dict__.pop('_translation_cache_state', None)
+    translation_keys = set()
+
+    if isinstance(instance, TranslatedPage):
+        if created:
+            translation_keys.add(instance.translation_key)
+        elif old is not None and (old['translation_key'], old['language_id']) != (instance.translation_key, instance.language_id):
+            translation_keys.update([old['translation_key'], instance.translation_key])
+
+    if old is not None and old['url_path'] != instance.url_path:
+        translation_keys.update(TranslatedPage.objects
+                                .descendant_of(instance, inclusive=True)
+                                .values_list('translation_key', flat=True)
+                                .distinct())
+
+    if translation_keys:
+        bump_on_commit(translation_keys)
+
+
+def language_changed(instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    # Language names and live status show up in every group with a page in
+    # this language, such as in language switchers.
+    translation_keys = TranslatedPage.objects\
+        .filter(language=instance)\
+        .values_list('translation_key', flat=True)\
+        .distinct()
+    bump_on_commit(translation_keys)
+
+
+def register_signal_handlers():
+    page_published.connect(translated_page_changed)
+    page_unpublished.connect(translated_page_changed)
+    pre_save.connect(page_pre_save)
+    post_save.connect(page_post_save)
+    post_delete.connect(translated_page_changed)
+    post_save.connect(language_changed, sender=Language)
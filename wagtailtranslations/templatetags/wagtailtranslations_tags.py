@@ -0,0 +1,83 @@
+from django import template
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from ..cache import get_cache, make_page_cache_key
+from ..models import TranslatedPage
+
+register = template.Library()
+
+
+class TranslationCacheNode(template.Node):
+    def __init__(self, nodelist, expire_time, fragment_name, page, vary_on):
+        self.nodelist = nodelist
+        self.expire_time = expire_time
+        self.fragment_name = fragment_name
+        self.page = page
+        self.vary_on = vary_on
+
+    def render(self, context):
+        # Previews render the unsaved page, which must never end up in the
+        # cache under the key of the live page.
+        request = context.get('request')
+        if getattr(request, 'is_preview', False):
+            return self.nodelist.render(context)
+
+        expire_time = self.expire_time.resolve(context)
+        if expire_time is None:
+            expire_time = DEFAULT_TIMEOUT
+        else:
+            try:
+                expire_time = int(expire_time)
+            except (ValueError, TypeError):
+                raise template.TemplateSyntaxError(
+                    '"translationcache" tag got a non-integer timeout value: %r' % expire_time)
+
+        # Shared templates also render search results, error pages and pages
+        # that are not translated. There is no translation group to key those
+        # on, so they are not cached.
+        page = self.page.resolve(context)
+        if not isinstance(page, TranslatedPage):
+            return self.nodelist.render(context)
+
+        vary_on = [self.fragment_name] + [var.resolve(context) for var in self.vary_on]
+        key = make_page_cache_key(page, vary_on)
+
+        cache = get_cache()
+        value = cache.get(key)
+        if value is None:
+            value = self.nodelist.render(context)
+            cache.set(key, value, expire_time)
+        return value
+
+
+@register.tag
+def translationcache(parser, token):
+    """
+    Cache a template fragment for a ``TranslatedPage``, until any page in its
+    translation group changes:
+
+    .. code-block:: html+django
+
+        {% load wagtailtranslations_tags %}
+        {% translationcache 500 language_switcher page %}
+            ...
+        {% endtranslationcache %}
+
+    The fragment is cached per page and active language. Any extra arguments
+    after the page are added to the cache key, as with ``{% cache %}``. A
+    timeout of ``None`` uses the default timeout of the cache. Nothing is
+    cached when previewing a page, or when ``page`` is not a
+    ``TranslatedPage``.
+    """
+    nodelist = parser.parse(('endtranslationcache',))
+    parser.delete_first_token()
+    bits = token.split_contents()
+    if len(bits) < 4:
+        raise template.TemplateSyntaxError(
+            "'%r' tag requires at least 3 arguments." % bits[0])
+    return TranslationCacheNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        bits[2],
+        parser.compile_filter(bits[3]),
+        [parser.compile_filter(bit) for bit in bits[4:]])